@@ -47,14 +47,19 @@ def read_parquet_from_s3(bucket_name, key):
 def list_tables_in_s3(bucket_name, prefix=''):
     """List all tables (Parquet files) available in the specified S3 bucket and path."""
     s3 = boto3.client('s3')
-    response = s3.list_objects_v2(Bucket=bucket_name, Prefix=prefix)
-    
-    if 'Contents' in response:
-        logger.info("Available tables (Parquet files):")
-        for obj in response['Contents']:
+    paginator = s3.get_paginator('list_objects_v2')
+
+    # Paginate so prefixes with more than 1000 objects are listed in full
+    found = False
+    for page in paginator.paginate(Bucket=bucket_name, Prefix=prefix):
+        for obj in page.get('Contents', []):
             if obj['Key'].endswith('.parquet'):
+                if not found:
+                    logger.info("Available tables (Parquet files):")
+                    found = True
                 logger.info(f"- {obj['Key']}")
-    else:
+
+    if not found:
         logger.info("No tables found.")
 
 
@@ -6,9 +6,10 @@ parameters for the United Nations OSAA MVP project.
 
 import logging
 import os
+import re
 import sys
+from typing import Any, Dict, Mapping, Optional
 
-import boto3
 import colorlog
 from botocore.exceptions import ClientError
 
@@ -22,28 +23,72 @@ ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
 # PROC_DATA_DIR = os.path.join(ROOT_DIR, 'processed')
 
 DATALAKE_DIR = os.path.join(ROOT_DIR, "data")
-RAW_DATA_DIR = os.getenv("RAW_DATA_DIR", os.path.join(DATALAKE_DIR, "raw"))
 STAGING_DATA_DIR = os.path.join(DATALAKE_DIR, "staging")
 MASTER_DATA_DIR = os.path.join(STAGING_DATA_DIR, "master")
 
-# Allow both Docker and local environment DuckDB path
-DB_PATH = os.getenv(
-    "DB_PATH", os.path.join(ROOT_DIR, "sqlMesh", "unosaa_data_pipeline.db")
-)
 
-# Environment configurations
-TARGET = os.getenv("TARGET", "dev").lower()
-USERNAME = os.getenv("USERNAME", "default").lower()
+def compute_config(env: Mapping[str, str]) -> Dict[str, Any]:
+    """
+    Derive the environment-dependent settings from a mapping of variables.
+
+    This is a pure function of ``env``, so settings for another environment
+    can be computed without mutating ``os.environ`` or reloading this module.
 
-# Construct S3 environment path
-S3_ENV = TARGET if TARGET == "prod" else f"dev/{TARGET}_{USERNAME}"
+    :param env: Environment variables (e.g. ``os.environ``)
+    :return: Dictionary of settings keyed by module constant name
+    """
+    raw_data_dir = env.get("RAW_DATA_DIR", os.path.join(DATALAKE_DIR, "raw"))
 
-ENABLE_S3_UPLOAD = os.getenv("ENABLE_S3_UPLOAD", "true").lower() == "true"
+    # Allow both Docker and local environment DuckDB path
+    db_path = env.get(
+        "DB_PATH", os.path.join(ROOT_DIR, "sqlMesh", "unosaa_data_pipeline.db")
+    )
 
-# S3 configurations with environment-based paths
-S3_BUCKET_NAME = os.getenv("S3_BUCKET_NAME", "unosaa-data-pipeline")
-LANDING_AREA_FOLDER = f"{S3_ENV}/landing"
-STAGING_AREA_FOLDER = f"{S3_ENV}/staging"
+    # Environment configurations
+    target = env.get("TARGET", "dev").lower()
+    username = env.get("USERNAME", "default").lower()
+
+    # Construct S3 environment path
+    s3_env = target if target == "prod" else f"dev/{target}_{username}"
+
+    return {
+        "RAW_DATA_DIR": raw_data_dir,
+        "DB_PATH": db_path,
+        "TARGET": target,
+        "USERNAME": username,
+        "S3_ENV": s3_env,
+        "ENABLE_S3_UPLOAD": env.get("ENABLE_S3_UPLOAD", "true").lower() == "true",
+        # S3 configurations with environment-based paths
+        "S3_BUCKET_NAME": env.get("S3_BUCKET_NAME", "unosaa-data-pipeline"),
+        "LANDING_AREA_FOLDER": f"{s3_env}/landing",
+        "STAGING_AREA_FOLDER": f"{s3_env}/staging",
+    }
+
+
+_CONFIG = compute_config(os.environ)
+
+RAW_DATA_DIR = _CONFIG["RAW_DATA_DIR"]
+DB_PATH = _CONFIG["DB_PATH"]
+TARGET = _CONFIG["TARGET"]
+USERNAME = _CONFIG["USERNAME"]
+S3_ENV = _CONFIG["S3_ENV"]
+ENABLE_S3_UPLOAD = _CONFIG["ENABLE_S3_UPLOAD"]
+S3_BUCKET_NAME = _CONFIG["S3_BUCKET_NAME"]
+LANDING_AREA_FOLDER = _CONFIG["LANDING_AREA_FOLDER"]
+STAGING_AREA_FOLDER = _CONFIG["STAGING_AREA_FOLDER"]
+
+
+# Expected shape of AWS access key IDs (long-term or temporary) and secrets
+AWS_ACCESS_KEY_PATTERN = re.compile(r"(?:AKIA|ASIA)[0-9A-Z]{16}")
+AWS_SECRET_KEY_PATTERN = re.compile(r"[A-Za-z0-9/+=]{40}")
+
+# Bounded retries and timeouts so a credential probe fails fast; passed to
+# botocore's Config when the probe client is built
+VALIDATION_CLIENT_SETTINGS = {
+    "connect_timeout": 3,
+    "read_timeout": 10,
+    "retries": {"mode": "standard", "max_attempts": 3},
+}
 
 
 # Custom Exception for Configuration Errors
@@ -165,6 +210,33 @@ def validate_config():
     logger.info("Configuration validation successful")
 
 
+def _get_s3_client(
+    access_key: str, secret_key: str, session_token: Optional[str], region: str
+) -> Any:
+    """
+    Build the S3 client used to probe the credentials.
+
+    :param access_key: AWS access key ID
+    :param secret_key: AWS secret access key
+    :param session_token: AWS session token, required for temporary (ASIA) keys
+    :param region: AWS region
+    :return: boto3 S3 client
+    """
+    # boto3 and botocore.config are slow to import and only needed once
+    # credentials pass the local checks
+    import boto3
+    from botocore.config import Config
+
+    return boto3.client(
+        "s3",
+        aws_access_key_id=access_key,
+        aws_secret_access_key=secret_key,
+        aws_session_token=session_token,
+        region_name=region,
+        config=Config(**VALIDATION_CLIENT_SETTINGS),
+    )
+
+
 def validate_aws_credentials():
     """
     Validate AWS credentials with structured error handling.
@@ -179,8 +251,8 @@ def validate_aws_credentials():
     """
 
     def _mask_sensitive(value):
-        """Mask sensitive information in logs."""
-        return "*" * len(value) if value else "NOT SET"
+        """Mask sensitive information in logs without revealing its length."""
+        return "SET" if value else "NOT SET"
 
     try:
         # Credential validation stages
@@ -193,11 +265,11 @@ def validate_aws_credentials():
             "AWS_DEFAULT_REGION",
         ]
 
-        # Log environment variable status
-        logger.debug("Checking Environment Variables:")
-        for var in required_vars:
-            value = os.getenv(var)
-            logger.debug(f"  {var}: {_mask_sensitive(value)}")
+        # Log environment variable status (skipped unless debugging)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Checking Environment Variables:")
+            for var in required_vars:
+                logger.debug("  %s: %s", var, _mask_sensitive(os.getenv(var)))
 
         # Validate variable presence
         for var in required_vars:
@@ -207,23 +279,18 @@ def validate_aws_credentials():
         # Extract credentials
         access_key = os.getenv("AWS_ACCESS_KEY_ID")
         secret_key = os.getenv("AWS_SECRET_ACCESS_KEY")
+        session_token = os.getenv("AWS_SESSION_TOKEN")
         region = os.getenv("AWS_DEFAULT_REGION", "us-east-1")
 
-        # Validate credential format
-        if not access_key.startswith("AKIA"):
-            logger.warning("Potential non-standard AWS Access Key ID format")
-
-        if len(access_key) < 10 or len(secret_key) < 20:
+        # Validate credential format before any network call
+        if not AWS_ACCESS_KEY_PATTERN.fullmatch(
+            access_key
+        ) or not AWS_SECRET_KEY_PATTERN.fullmatch(secret_key):
             raise ConfigurationError("Incomplete or malformed AWS credentials")
 
         # S3 client creation and validation
         try:
-            s3_client = boto3.client(
-                "s3",
-                aws_access_key_id=access_key,
-                aws_secret_access_key=secret_key,
-                region_name=region,
-            )
+            s3_client = _get_s3_client(access_key, secret_key, session_token, region)
 
             # Lightweight bucket listing test
             try:
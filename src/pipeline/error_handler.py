@@ -5,7 +5,7 @@ Global error handling and logging utilities for the OSAA MVP Pipeline.
 import sys
 import traceback
 
-from pipeline.logging_config import create_logger, log_exception
+from pipeline.logging_config import create_logger
 
 # Create a logger for this module
 logger = create_logger(__name__)
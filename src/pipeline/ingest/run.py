@@ -6,16 +6,14 @@ and optionally uploading them to S3 for the United Nations OSAA MVP project.
 
 import os
 import re
-import tempfile
+from concurrent.futures import ThreadPoolExecutor
 
-import boto3
-from botocore.exceptions import ClientError, NoCredentialsError
+from botocore.exceptions import ClientError
 import duckdb
-from typing import Dict, Optional
+from typing import Dict, List, Optional, Tuple
 
 from pipeline.config import (
     ENABLE_S3_UPLOAD,
-    LANDING_AREA_FOLDER,
     RAW_DATA_DIR,
     S3_BUCKET_NAME,
     TARGET,
@@ -24,15 +22,31 @@ from pipeline.config import (
 from pipeline.exceptions import (
     FileConversionError,
     IngestError,
-    S3ConfigurationError,
-    S3OperationError,
 )
 from pipeline.logging_config import create_logger, log_exception
-from pipeline.utils import s3_init
+from pipeline.s3_stream import parse_s3_path, stream_query_to_s3
+from pipeline.utils import (
+    SOURCE_CHECKSUM_KEY,
+    file_checksum,
+    iter_relative_file_paths,
+    s3_init,
+)
 
 # Initialize logger
 logger = create_logger(__name__)
 
+# Table name is the file name without its directory or extension
+TABLE_NAME_PATTERN = re.compile(r"[^/]+(?=\.)")
+
+# Files whose names start with symbols (like hidden files) are not ingested
+SYMBOL_PREFIX_PATTERN = re.compile(r"^[~!@#$%^&*()_\-+={[}}|:;\"'<,>.?/]+")
+
+# DuckDB cannot bind identifiers as parameters, so table names are whitelisted
+IDENTIFIER_PATTERN = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+# Number of files converted and uploaded concurrently
+INGEST_WORKERS = int(os.getenv("INGEST_WORKERS", "4"))
+
 
 class Ingest:
     """Manage the data ingestion process for the United Nations OSAA MVP project.
@@ -50,66 +64,73 @@ class Ingest:
     """
 
     def __init__(self) -> None:
-        """Initialize the IngestProcess with DuckDB connection and S3 session.
+        """Initialize the IngestProcess with DuckDB connection and S3 client.
 
-        Sets up a DuckDB connection and optionally initializes an S3 session
+        Sets up a DuckDB connection and optionally initializes an S3 client
         based on the configuration settings.
         """
         logger.info("Initializing Ingest Process")
 
-        # Initialize DuckDB with required extensions
         self.con = duckdb.connect()
-        self.con.install_extension('httpfs')
-        self.con.load_extension('httpfs')
-        
+
         if ENABLE_S3_UPLOAD:
             logger.info("Initializing S3 client...")
-            self.s3_client, self.session = s3_init(return_session=True)
+            self.s3_client = s3_init()
             logger.info("S3 Client Initialized")
         else:
             logger.warning("S3 upload is disabled")
             self.s3_client = None
-            self.session = None
 
-    def setup_s3_secret(self):
+            # Uploads stream through boto3; only the table COPY fallback
+            # writes through DuckDB and needs httpfs. Installing may hit the
+            # network, so skip it when already installed
+            installed = self.con.execute(
+                "SELECT installed FROM duckdb_extensions() WHERE extension_name = ?",
+                ["httpfs"],
+            ).fetchone()
+            if not (installed and installed[0]):
+                self.con.install_extension('httpfs')
+            self.con.load_extension('httpfs')
+
+    def remove_stale_s3_secret(self):
         """
-        Set up the S3 secret in DuckDB for S3 access using AWS credential chain.
+        Drop the persistent S3 secret created by earlier ingest runs.
 
-        :raises S3ConfigurationError: If there are issues setting up S3 secret
+        DuckDB needs no S3 credentials for the streamed uploads. Earlier
+        versions stored assumed-role credentials in a persistent
+        ``my_s3_secret``, which outlives them and takes precedence over the
+        environment credentials other DuckDB sessions (such as SQLMesh's)
+        rely on. Failing to drop it does not stop the ingestion.
         """
-        if not ENABLE_S3_UPLOAD:
-            logger.info("S3 upload disabled, skipping S3 secret setup")
-            return
-
         try:
-            logger.info("🔐 Setting up S3 Secret in DuckDB")
-            logger.info("   Creating S3 secret with assumed credentials")
-
-            region = self.session.region_name
-            credentials = self.session.get_credentials().get_frozen_credentials()
-            logger.info(f"   Using AWS region: {region}")
-
-            # Drop existing secret if it exists
-            self.con.sql("DROP SECRET IF EXISTS my_s3_secret")
-            logger.info("   Dropped existing S3 secret")
-
-            # Create the SQL statement
-            sql_statement = f"""
-                CREATE PERSISTENT SECRET my_s3_secret (
-                    TYPE S3,
-                    KEY_ID '{credentials.access_key}',
-                    SECRET '{credentials.secret_key}',
-                    SESSION_TOKEN '{credentials.token}',
-                    REGION '{region}'
-                );
-            """
-            self.con.sql(sql_statement)
-            logger.info("✅ S3 secret successfully created in DuckDB")
+            self.con.execute("DROP PERSISTENT SECRET IF EXISTS my_s3_secret")
+        except duckdb.Error as e:
+            logger.warning("Could not drop stale DuckDB S3 secret: %s", e)
 
-        except Exception as e:
-            error_msg = f"AWS Credentials Error: {e}"
-            log_exception(logger, e, {"context": "S3 secret setup"})
-            raise S3ConfigurationError(error_msg)
+    def is_upload_current(self, s3_file_path: str, checksum: str) -> bool:
+        """Check whether S3 already holds a Parquet built from the same CSV.
+
+        :param s3_file_path: S3 path of the Parquet file
+        :param checksum: Checksum of the local CSV file
+        :return: True if the uploaded object was built from identical input
+        """
+        bucket, key = parse_s3_path(s3_file_path)
+        try:
+            response = self.s3_client.head_object(Bucket=bucket, Key=key)
+        except ClientError as e:
+            code = e.response["Error"]["Code"]
+            if code in ("404", "NoSuchKey", "NotFound"):
+                return False
+            # Without s3:ListBucket, S3 answers 403 for missing keys too
+            if code in ("403", "AccessDenied", "Forbidden"):
+                logger.warning(
+                    "Cannot check existing upload %s (%s); uploading anyway",
+                    s3_file_path,
+                    code,
+                )
+                return False
+            raise
+        return response.get("Metadata", {}).get(SOURCE_CHECKSUM_KEY) == checksum
 
     def convert_csv_to_parquet_and_upload(
         self, local_file_path: str, s3_file_path: Optional[str] = None
@@ -122,54 +143,94 @@ class Ingest:
         """
         try:
             # Extract table name from filename
-            table_name = re.search(r"[^/]+(?=\.)", local_file_path)
+            table_name = TABLE_NAME_PATTERN.search(local_file_path)
             table_name = (
                 table_name.group(0).replace("-", "_") if table_name else "UNNAMED"
             )
+            if not IDENTIFIER_PATTERN.match(table_name):
+                raise FileConversionError(f"Invalid table name: {table_name}")
             fully_qualified_name = "source." + table_name
-            logger.info(f"Processing file {local_file_path} into table {fully_qualified_name}")
-
-            # Create schema and table
-            logger.info("Creating schema and table...")
-            self.con.sql("CREATE SCHEMA IF NOT EXISTS source")
-            self.con.sql(f"DROP TABLE IF EXISTS {fully_qualified_name}")
-            self.con.sql(
-                f"""
-                CREATE TABLE {fully_qualified_name} AS
-                SELECT *
-                FROM read_csv('{local_file_path}', header = true)
-            """
-            )
-            logger.info(f"Successfully created table {fully_qualified_name}")
-
-            # Verify table was created and has data
-            try:
-                row_count = self.con.sql(f"SELECT COUNT(*) FROM {fully_qualified_name}").fetchone()[0]
-                logger.info(f"Table {fully_qualified_name} created with {row_count} rows")
-            except Exception as e:
-                logger.error(f"Failed to get row count for table {fully_qualified_name}: {e}")
-                raise FileConversionError(f"Failed to verify table creation: {e}")
-
-            # Attempt S3 upload
-            logger.info(f"Attempting to upload to S3: {s3_file_path}")
-            copy_sql = f"""
-                COPY (SELECT * FROM {fully_qualified_name})
-                TO '{s3_file_path}'
-                (FORMAT PARQUET)
-            """
-            self.con.sql(copy_sql)
+
+            # Skip files whose content has not changed since the last upload
+            checksum = None
+            if self.s3_client is not None:
+                checksum = file_checksum(local_file_path)
+                if self.is_upload_current(s3_file_path, checksum):
+                    logger.info("Skipping unchanged file %s", local_file_path)
+                    return
+
+            logger.info("Attempting to upload to S3: %s", s3_file_path)
+            if self.s3_client is not None:
+                # Stream the CSV straight into Parquet parts, overlapping
+                # encoding with multipart uploads, without first loading it
+                # into a table. The upload runs on its own cursor so the
+                # shared connection is not held for the whole transfer
+                with self.con.cursor() as cursor:
+                    row_count = stream_query_to_s3(
+                        cursor,
+                        "SELECT * FROM read_csv(?, header = true)",
+                        self.s3_client,
+                        s3_file_path,
+                        metadata={SOURCE_CHECKSUM_KEY: checksum},
+                        parameters=[local_file_path],
+                    )
+                logger.info("Converted %s rows from %s", row_count, local_file_path)
+            else:
+                logger.info(
+                    "Processing file %s into table %s",
+                    local_file_path,
+                    fully_qualified_name,
+                )
+
+                # Create schema and table
+                logger.info("Creating schema and table...")
+                self.con.sql("CREATE SCHEMA IF NOT EXISTS source")
+                self.con.execute(
+                    f"""
+                    CREATE OR REPLACE TABLE {fully_qualified_name} AS
+                    SELECT *
+                    FROM read_csv(?, header = true)
+                """,
+                    [local_file_path],
+                )
+                logger.info("Successfully created table %s", fully_qualified_name)
+
+                # Verify table was created and has data
+                try:
+                    row_count = self.con.sql(
+                        f"SELECT COUNT(*) FROM {fully_qualified_name}"
+                    ).fetchone()[0]
+                    logger.info(
+                        "Table %s created with %s rows", fully_qualified_name, row_count
+                    )
+                except Exception as e:
+                    logger.error(
+                        "Failed to get row count for table %s: %s",
+                        fully_qualified_name,
+                        e,
+                    )
+                    raise FileConversionError(f"Failed to verify table creation: {e}")
+
+                copy_sql = f"""
+                    COPY (SELECT * FROM {fully_qualified_name})
+                    TO '{s3_file_path}'
+                    (FORMAT PARQUET)
+                """
+                self.con.execute(copy_sql)
 
             logger.info(
-                f"Successfully converted and uploaded {local_file_path} to {s3_file_path}"
+                "Successfully converted and uploaded %s to %s",
+                local_file_path,
+                s3_file_path,
             )
 
         except FileNotFoundError as e:
-            logger.error(f"File not found error: {e}")
+            logger.error("File not found error: %s", e)
             raise FileConversionError(str(e))
         except Exception as e:
-            logger.error(f"Unexpected error: {e}")
-            logger.error(f"Error type: {type(e).__name__}")
-            logger.error(f"Error details: {str(e)}")
+            logger.error("Unexpected error: %s", e)
+            logger.error("Error type: %s", type(e).__name__)
+            logger.error("Error details: %s", e)
             raise FileConversionError(f"Conversion failed: {e}")
 
     def generate_file_to_s3_folder_mapping(self, raw_data_dir: str) -> dict:
@@ -184,24 +245,12 @@ class Ingest:
         """
         file_to_s3_folder_mapping: Dict[str, str] = {}
 
-        # Pattern to exclude any folder/file name with symbols (like hidden files)
-        symbols = r"^[~!@#$%^&*()_\-+={[}}|:;\"'<,>.?/]+"
-
-        # Traverse the raw_data directory
-        for subdir, _, files in os.walk(raw_data_dir):
-            logger.info(f"Walking directory: {subdir}, found files: {files}")
-
-            # Get the relative path of the current subdirectory
-            rel_subdir = os.path.relpath(subdir, raw_data_dir)
+        for rel_subdir, file in iter_relative_file_paths(raw_data_dir, ".csv"):
+            # Skip files starting with symbols
+            if not SYMBOL_PREFIX_PATTERN.match(file):
+                file_to_s3_folder_mapping[file] = rel_subdir
 
-            for file in files:
-                # Skip files starting with symbols
-                if not re.match(symbols, file) and file.endswith(".csv"):
-                    file_to_s3_folder_mapping[file] = (
-                        rel_subdir if rel_subdir != "." else ""
-                    )
-
-        logger.info(f"Generated file mapping: {file_to_s3_folder_mapping}")
+        logger.info("Generated file mapping: %s", file_to_s3_folder_mapping)
         return file_to_s3_folder_mapping
 
     def convert_and_upload_files(self):
@@ -210,6 +259,14 @@ class Ingest:
         """
         try:
             file_mapping = self.generate_file_to_s3_folder_mapping(RAW_DATA_DIR)
+
+            # Construct the S3 landing prefix once for all files
+            logger.info(
+                "Constructing S3 path with TARGET=%s, USERNAME=%s", TARGET, USERNAME
+            )
+            s3_landing_prefix = f"s3://{S3_BUCKET_NAME}/{TARGET}/landing"
+
+            tasks: List[Tuple[str, str]] = []
             for file_name_csv, s3_sub_folder in file_mapping.items():
                 local_file_path = os.path.join(
                     RAW_DATA_DIR, s3_sub_folder, file_name_csv
@@ -218,23 +275,39 @@ class Ingest:
                 # Convert filename to Parquet
                 file_name_pq = f"{os.path.splitext(file_name_csv)[0]}.parquet"
 
-                # Construct S3 path
-                logger.info(f"Constructing S3 path with TARGET={TARGET}, USERNAME={USERNAME}")
-                s3_file_path = f"s3://{S3_BUCKET_NAME}/{TARGET}/landing/{s3_sub_folder}/{file_name_pq}"
-                
+                s3_file_path = f"{s3_landing_prefix}/{s3_sub_folder}/{file_name_pq}"
                 logger.info(s3_file_path)
 
                 if os.path.isfile(local_file_path):
-                    self.convert_csv_to_parquet_and_upload(
-                        local_file_path, s3_file_path
-                    )
+                    tasks.append((local_file_path, s3_file_path))
                 else:
-                    logger.warning(f"File not found: {local_file_path}")
+                    logger.warning("File not found: %s", local_file_path)
+
+            # Streamed uploads each run on their own cursor and overlap well;
+            # the table-based COPY fallback shares one connection, so it stays
+            # sequential
+            workers = INGEST_WORKERS if self.s3_client is not None else 1
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                futures = [
+                    executor.submit(
+                        self.convert_csv_to_parquet_and_upload,
+                        local_file_path,
+                        s3_file_path,
+                    )
+                    for local_file_path, s3_file_path in tasks
+                ]
+                try:
+                    for future in futures:
+                        future.result()
+                except Exception:
+                    # Do not start any more files once one has failed
+                    executor.shutdown(cancel_futures=True)
+                    raise
 
             logger.info("Ingestion process completed successfully.")
 
         except Exception as e:
-            logger.error(f"❌ Error during file ingestion: {e}")
+            logger.error("❌ Error during file ingestion: %s", e)
             raise
 
     def run(self):
@@ -246,9 +319,7 @@ class Ingest:
         try:
             logger.info(f"Starting ingestion process with TARGET={TARGET}")
             
-            # Setup S3 secret if enabled
-            if ENABLE_S3_UPLOAD:
-                self.setup_s3_secret()
+            self.remove_stale_s3_secret()
 
             # Convert and upload files
             self.convert_and_upload_files()
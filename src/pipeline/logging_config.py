@@ -9,11 +9,36 @@ import logging
 import os
 import sys
 import traceback
-from typing import Optional, Union
+from logging.handlers import RotatingFileHandler
+from typing import Dict, Optional, Tuple, Union
 
 import colorlog
 
 
+# Formatters are stateless, so one instance of each is shared by all handlers
+CONSOLE_FORMATTER = colorlog.ColoredFormatter(
+    "%(log_color)s[%(levelname)s]%(reset)s %(blue)s[%(name)s]%(reset)s %(message)s",
+    log_colors={
+        "DEBUG": "cyan",
+        "INFO": "green",
+        "WARNING": "yellow",
+        "ERROR": "red",
+        "CRITICAL": "red,bg_white",
+    },
+    secondary_log_colors={},
+)
+FILE_FORMATTER = logging.Formatter(
+    "%(asctime)s - [%(levelname)s] - [%(name)s] - %(message)s"
+)
+
+# Rotate log files so they cannot grow without bound
+LOG_FILE_MAX_BYTES = 10 * 1024 * 1024
+LOG_FILE_BACKUP_COUNT = 5
+
+# (log_dir, log_file) each configured logger's handlers were built for
+_logger_outputs: Dict[str, Tuple[Optional[str], Optional[str]]] = {}
+
+
 def create_logger(
     name: Optional[str] = None,
     log_level: Union[int, str] = logging.INFO,
@@ -23,6 +48,9 @@ def create_logger(
     """
     Create a structured, color-coded logger with optional file logging.
 
+    Handlers are built once per logger name and only rebuilt when the file
+    output changes; repeated calls just apply the requested level.
+
     :param name: Name of the logger (typically __name__)
     :param log_level: Logging level (default: logging.INFO)
     :param log_dir: Directory to store log files (optional)
@@ -30,10 +58,19 @@ def create_logger(
     :return: Configured logger instance
     """
     # Create logger
-    logger = colorlog.getLogger(name or __name__)
+    logger_name = name or __name__
+    logger = colorlog.getLogger(logger_name)
     logger.setLevel(log_level)
     logger.propagate = False
 
+    # Reuse the handlers of an already-configured logger
+    outputs = (log_dir, log_file)
+    if logger.handlers and _logger_outputs.get(logger_name) == outputs:
+        for handler in logger.handlers:
+            handler.setLevel(log_level)
+        return logger
+    _logger_outputs[logger_name] = outputs
+
     # Remove any existing handlers
     for handler in logger.handlers[:]:
         logger.removeHandler(handler)
@@ -42,19 +79,7 @@ def create_logger(
     console_handler = colorlog.StreamHandler(sys.stdout)
     console_handler.setLevel(log_level)
 
-    # Custom log format with clear structure
-    formatter = colorlog.ColoredFormatter(
-        "%(log_color)s[%(levelname)s]%(reset)s %(blue)s[%(name)s]%(reset)s %(message)s",
-        log_colors={
-            "DEBUG": "cyan",
-            "INFO": "green",
-            "WARNING": "yellow",
-            "ERROR": "red",
-            "CRITICAL": "red,bg_white",
-        },
-        secondary_log_colors={},
-    )
-    console_handler.setFormatter(formatter)
+    console_handler.setFormatter(CONSOLE_FORMATTER)
     logger.addHandler(console_handler)
 
     # Optional file logging
@@ -70,15 +95,14 @@ def create_logger(
         if log_dir:
             log_file = os.path.join(log_dir, log_file)
 
-        # Create file handler
-        file_handler = logging.FileHandler(log_file)
-        file_handler.setLevel(log_level)
-
-        # Plain text formatter for file logs
-        file_formatter = logging.Formatter(
-            "%(asctime)s - [%(levelname)s] - [%(name)s] - %(message)s"
+        # Create rotating file handler with plain text formatting
+        file_handler = RotatingFileHandler(
+            log_file,
+            maxBytes=LOG_FILE_MAX_BYTES,
+            backupCount=LOG_FILE_BACKUP_COUNT,
         )
-        file_handler.setFormatter(file_formatter)
+        file_handler.setLevel(log_level)
+        file_handler.setFormatter(FILE_FORMATTER)
         logger.addHandler(file_handler)
 
     return logger
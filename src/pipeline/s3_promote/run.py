@@ -4,20 +4,312 @@ This module provides functionality to promote data between different S3 environm
 (e.g., dev to prod) in the United Nations OSAA MVP project.
 """
 
-import boto3
+import heapq
+from collections import deque
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    FIRST_EXCEPTION,
+    Future,
+    ThreadPoolExecutor,
+    wait,
+)
+from itertools import chain, islice
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from boto3.s3.transfer import TransferConfig
 from botocore.exceptions import ClientError
 
 from pipeline.config import S3_BUCKET_NAME
 from pipeline.exceptions import S3OperationError
 from pipeline.logging_config import create_logger
-from pipeline.utils import s3_init
+from pipeline.utils import S3_CLIENT_CONFIG, SOURCE_CHECKSUM_KEY, s3_init
 
 logger = create_logger(__name__)
 
+# Concurrent copy/delete requests; kept within the S3 client connection pool
+PROMOTE_WORKERS = min(32, S3_CLIENT_CONFIG.max_pool_connections)
+
+# Requests submitted ahead of the workers; bounds memory for large prefixes
+MAX_PENDING_REQUESTS = 2 * PROMOTE_WORKERS
+
+# Sub-folder listings started ahead of the one being consumed
+LISTING_LOOKAHEAD = 4
+
+# Keys removed per DeleteObjects request (the S3 maximum)
+DELETE_BATCH_SIZE = 1000
+
+# Objects at least this large are copied in parallel parts (copy_object is
+# capped at 5 GiB); smaller ones take a single CopyObject request
+MULTIPART_COPY_THRESHOLD = 100 * 1024 * 1024
+
+# Part size and per-object concurrency for multipart copies
+MULTIPART_COPY_CONFIG = TransferConfig(
+    multipart_threshold=MULTIPART_COPY_THRESHOLD,
+    multipart_chunksize=64 * 1024 * 1024,
+    max_concurrency=8,
+)
+
+
+def _list_page(
+    s3_client: Any,
+    prefix: str,
+    continuation_token: Optional[str] = None,
+    delimiter: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Fetch a single ListObjectsV2 page.
+
+    Args:
+        s3_client: boto3 S3 client
+        prefix: Key prefix to list
+        continuation_token: Token of the page to fetch (default: first page)
+        delimiter: Delimiter grouping keys into common prefixes
+
+    Returns:
+        ListObjectsV2 response
+    """
+    kwargs = {'Bucket': S3_BUCKET_NAME, 'Prefix': prefix}
+    if continuation_token:
+        kwargs['ContinuationToken'] = continuation_token
+    if delimiter:
+        kwargs['Delimiter'] = delimiter
+    return s3_client.list_objects_v2(**kwargs)
+
+
+def _iter_listing(
+    s3_client: Any, prefix: str, first_page: Future, executor: ThreadPoolExecutor
+) -> Iterator[Dict[str, Any]]:
+    """
+    Yield the objects under a prefix one page at a time.
+
+    The next page is requested as soon as the current one arrives, so its
+    round trip overlaps with consuming the current page and at most two
+    pages are held at once.
+
+    Args:
+        s3_client: boto3 S3 client
+        prefix: Key prefix being listed
+        first_page: Future for the prefix's first ListObjectsV2 page
+        executor: Executor fetching the following pages
+
+    Yields:
+        Object summaries in key order
+    """
+    page_future: Optional[Future] = first_page
+    while page_future is not None:
+        page = page_future.result()
+        page_future = None
+        if page.get('IsTruncated'):
+            page_future = executor.submit(
+                _list_page, s3_client, prefix, page['NextContinuationToken']
+            )
+        yield from page.get('Contents', ())
+
+
+def _iter_objects(
+    s3_client: Any,
+    prefix: str,
+    executor: ThreadPoolExecutor,
+    lookahead: int = LISTING_LOOKAHEAD,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Yield the objects under a prefix, listing upcoming sub-folders ahead.
+
+    ListObjectsV2 pages have to be fetched one after another, so a single
+    listing costs one round trip per 1000 keys. The top level is listed with
+    a delimiter, and the first pages of the next few sub-folders are fetched
+    on the executor while the current one is consumed. Only a bounded number
+    of pages is held, however many keys the prefix contains.
+
+    Args:
+        s3_client: boto3 S3 client
+        prefix: Key prefix ending in "/"
+        executor: Executor fetching the listing pages
+        lookahead: Top-level entries whose listing is started ahead
+
+    Yields:
+        Object summaries in lexicographic key order
+    """
+    paginator = s3_client.get_paginator('list_objects_v2')
+    pages = paginator.paginate(Bucket=S3_BUCKET_NAME, Prefix=prefix, Delimiter='/')
+    # Each sub-folder covers a contiguous key range, so expanding it in place
+    # among the top-level objects keeps S3's key order
+    entries = chain.from_iterable(
+        heapq.merge(
+            page.get('Contents', ()),
+            page.get('CommonPrefixes', ()),
+            key=lambda entry: entry.get('Key', entry.get('Prefix')),
+        )
+        for page in pages
+    )
+
+    def start(entry: Dict[str, Any]) -> Tuple[Dict[str, Any], Optional[Future]]:
+        if 'Prefix' not in entry:
+            return entry, None
+        return entry, executor.submit(_list_page, s3_client, entry['Prefix'])
+
+    window = deque(map(start, islice(entries, lookahead)))
+    while window:
+        entry, first_page = window.popleft()
+        window.extend(map(start, islice(entries, 1)))
+        if first_page is None:
+            yield entry
+        else:
+            yield from _iter_listing(s3_client, entry['Prefix'], first_page, executor)
+
+
+def _pair_objects(
+    source_objects: Iterable[Dict[str, Any]],
+    target_objects: Iterable[Dict[str, Any]],
+    source_prefix: str,
+    target_prefix: str,
+) -> Iterator[Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]]]]:
+    """
+    Pair source and target objects that share a key relative to their prefix.
+
+    Both listings must be in key order, as S3 returns them, so they can be
+    walked in lock-step without holding either in memory.
+
+    Args:
+        source_objects: Object summaries under source_prefix, in key order
+        target_objects: Object summaries under target_prefix, in key order
+        source_prefix: Prefix of the source keys
+        target_prefix: Prefix of the target keys
+
+    Yields:
+        (source, target) pairs; either side is None when it has no match
+    """
+    source_start = len(source_prefix)
+    target_start = len(target_prefix)
+    sources = iter(source_objects)
+    targets = iter(target_objects)
+    source = next(sources, None)
+    target = next(targets, None)
+
+    while source is not None or target is not None:
+        if target is None:
+            yield source, None
+            source = next(sources, None)
+        elif source is None:
+            yield None, target
+            target = next(targets, None)
+        else:
+            source_rel = source['Key'][source_start:]
+            target_rel = target['Key'][target_start:]
+            if source_rel == target_rel:
+                yield source, target
+                source = next(sources, None)
+                target = next(targets, None)
+            elif source_rel < target_rel:
+                yield source, None
+                source = next(sources, None)
+            else:
+                yield None, target
+                target = next(targets, None)
+
+
+def _is_current(source: Dict[str, Any], target: Dict[str, Any]) -> bool:
+    """
+    Check from the listings alone whether a target holds the source content.
+
+    Args:
+        source: Source object summary from ListObjectsV2
+        target: Target object summary from ListObjectsV2
+
+    Returns:
+        True if both objects have the same size and ETag
+    """
+    return source['Size'] == target['Size'] and source['ETag'] == target['ETag']
+
+
+def _source_checksum(s3_client: Any, key: str) -> Optional[str]:
+    """
+    Read the source-file checksum stored in an object's metadata.
+
+    Args:
+        s3_client: boto3 S3 client
+        key: Object key
+
+    Returns:
+        The stored checksum, or None if the object has none or is gone
+    """
+    try:
+        response = s3_client.head_object(Bucket=S3_BUCKET_NAME, Key=key)
+    except ClientError as e:
+        if e.response['Error']['Code'] in ('404', 'NoSuchKey', 'NotFound'):
+            return None
+        raise
+    return response.get('Metadata', {}).get(SOURCE_CHECKSUM_KEY)
+
+
+def _has_same_source(s3_client: Any, source_key: str, target_key: str) -> bool:
+    """
+    Check whether two objects were built from the same source file.
+
+    Copying a multipart upload produces an object with a different ETag for
+    the same bytes, so ETags cannot tell those copies apart from changed
+    objects. Ingest stores the checksum of the source CSV on each object and
+    copies keep it, which identifies the content instead.
+
+    Args:
+        s3_client: boto3 S3 client
+        source_key: Key of the source object
+        target_key: Key of the target object
+
+    Returns:
+        True if both objects carry the same source checksum
+    """
+    checksum = _source_checksum(s3_client, source_key)
+    return checksum is not None and checksum == _source_checksum(
+        s3_client, target_key
+    )
+
+
+def _run_bounded(
+    executor: ThreadPoolExecutor,
+    func: Callable[..., None],
+    calls: Iterable[Tuple[Any, ...]],
+    max_pending: int = MAX_PENDING_REQUESTS,
+) -> None:
+    """
+    Run func for each argument tuple, keeping at most max_pending queued.
+
+    Arguments are consumed lazily, so neither they nor their futures are all
+    held in memory at once. The first failure is raised as soon as it
+    happens and calls that have not started yet are cancelled.
+
+    Args:
+        executor: Executor running the calls
+        func: Function to call
+        calls: Argument tuples, one per call
+        max_pending: Maximum number of submitted, unfinished calls
+
+    Raises:
+        Exception: The first error raised by a call
+    """
+    pending = set()
+    try:
+        for args in calls:
+            if len(pending) >= max_pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    future.result()
+            pending.add(executor.submit(func, *args))
+
+        done, pending = wait(pending, return_when=FIRST_EXCEPTION)
+        for future in done:
+            future.result()
+    except BaseException:
+        for future in pending:
+            future.cancel()
+        raise
+
+
 def promote_environment(
     source_env: str = "dev",
     target_env: str = "prod",
     folder: str = "landing",
+    s3_client: Optional[Any] = None,
 ) -> None:
     """
     Promote contents from source to target environment using boto3.
@@ -26,6 +318,7 @@ def promote_environment(
         source_env: Source environment (default: "dev")
         target_env: Target environment (default: "prod")
         folder: Folder to promote (default: "landing")
+        s3_client: Already-initialized S3 client (default: shared s3_init client)
 
     Raises:
         S3OperationError: If promotion operation fails
@@ -36,41 +329,107 @@ def promote_environment(
 
         logger.info(f"Starting promotion from {source_prefix} to {target_prefix}")
         
-        # Initialize S3 client using existing utility
-        s3_client = s3_init()
+        # Initialize S3 client using existing utility unless one was provided
+        if s3_client is None:
+            s3_client = s3_init()
         
-        # Get list of all objects in source
-        source_objects = set()
-        paginator = s3_client.get_paginator('list_objects_v2')
-        for page in paginator.paginate(Bucket=S3_BUCKET_NAME, Prefix=source_prefix):
-            if 'Contents' in page:
-                for obj in page['Contents']:
-                    source_key = obj['Key']
-                    source_objects.add(source_key)
-                    target_key = source_key.replace(source_prefix, target_prefix, 1)
-                    
-                    # Copy object to new location
-                    logger.info(f"Copying {source_key} to {target_key}")
-                    s3_client.copy_object(
-                        Bucket=S3_BUCKET_NAME,
-                        CopySource={'Bucket': S3_BUCKET_NAME, 'Key': source_key},
-                        Key=target_key
+        def copy_object(
+            source_key: str, target_key: str, size: int, check_source: bool
+        ) -> None:
+            if check_source and _has_same_source(s3_client, source_key, target_key):
+                logger.debug("Skipping unchanged %s", source_key)
+                return
+            logger.info("Copying %s to %s", source_key, target_key)
+            copy_source = {'Bucket': S3_BUCKET_NAME, 'Key': source_key}
+            # The listing already gives the size, so only large objects pay
+            # for the managed copy's HeadObject and multipart requests
+            if size >= MULTIPART_COPY_THRESHOLD:
+                # s3transfer releases before 0.18 do not carry the source's
+                # metadata over to the multipart upload, which would drop
+                # the source checksum that incremental promotion relies on
+                head = s3_client.head_object(Bucket=S3_BUCKET_NAME, Key=source_key)
+                extra_args = {'Metadata': head.get('Metadata', {})}
+                if 'ContentType' in head:
+                    extra_args['ContentType'] = head['ContentType']
+                s3_client.copy(
+                    copy_source,
+                    S3_BUCKET_NAME,
+                    target_key,
+                    ExtraArgs=extra_args,
+                    Config=MULTIPART_COPY_CONFIG,
+                )
+            else:
+                s3_client.copy_object(
+                    Bucket=S3_BUCKET_NAME,
+                    CopySource=copy_source,
+                    Key=target_key
+                )
+
+        def delete_objects(target_keys: List[str]) -> None:
+            for target_key in target_keys:
+                logger.info("Deleting %s from target", target_key)
+            response = s3_client.delete_objects(
+                Bucket=S3_BUCKET_NAME,
+                Delete={
+                    'Objects': [{'Key': key} for key in target_keys],
+                    'Quiet': True,
+                },
+            )
+            # DeleteObjects reports per-key failures in the response body
+            errors = response.get('Errors', [])
+            if errors:
+                failed = ", ".join(
+                    f"{error['Key']} ({error.get('Code')})" for error in errors
+                )
+                raise S3OperationError(f"Failed to delete from target: {failed}")
+
+        # Each copy/delete is a round trip with no local work, so run them
+        # concurrently instead of one after another
+        with ThreadPoolExecutor(max_workers=PROMOTE_WORKERS) as executor:
+            pairs = _pair_objects(
+                _iter_objects(s3_client, source_prefix, executor),
+                _iter_objects(s3_client, target_prefix, executor),
+                source_prefix,
+                target_prefix,
+            )
+
+            # Copy new and changed source objects to the target and note the
+            # target objects that no longer exist in source
+            orphans: List[str] = []
+            source_start = len(source_prefix)
+
+            def copies() -> Iterator[Tuple[str, str, int, bool]]:
+                for source_obj, target_obj in pairs:
+                    if source_obj is None:
+                        orphans.append(target_obj['Key'])
+                        continue
+                    source_key = source_obj['Key']
+                    if target_obj is not None and _is_current(source_obj, target_obj):
+                        logger.debug("Skipping unchanged %s", source_key)
+                        continue
+                    # Every listed key starts with source_prefix, so swap it by
+                    # slicing rather than searching the key
+                    target_key = target_prefix + source_key[source_start:]
+                    # Same-size objects with different ETags may still hold
+                    # the same content; the copy worker checks their metadata
+                    check_source = (
+                        target_obj is not None
+                        and target_obj['Size'] == source_obj['Size']
                     )
+                    yield source_key, target_key, source_obj['Size'], check_source
+
+            _run_bounded(executor, copy_object, copies())
+
+            # Only delete once every copy has succeeded
+            _run_bounded(
+                executor,
+                delete_objects,
+                (
+                    (orphans[start:start + DELETE_BATCH_SIZE],)
+                    for start in range(0, len(orphans), DELETE_BATCH_SIZE)
+                ),
+            )
 
-        # Get list of all objects in target and delete those not in source
-        for page in paginator.paginate(Bucket=S3_BUCKET_NAME, Prefix=target_prefix):
-            if 'Contents' in page:
-                for obj in page['Contents']:
-                    target_key = obj['Key']
-                    corresponding_source_key = target_key.replace(target_prefix, source_prefix, 1)
-                    
-                    if corresponding_source_key not in source_objects:
-                        logger.info(f"Deleting {target_key} from target")
-                        s3_client.delete_object(
-                            Bucket=S3_BUCKET_NAME,
-                            Key=target_key
-                        )
-            
         logger.info("✅ Promotion completed successfully")
 
     except ClientError as e:
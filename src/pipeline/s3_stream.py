@@ -0,0 +1,218 @@
+"""Streaming upload of DuckDB query results to S3.
+
+This module pipelines Parquet encoding and S3 multipart uploads so that
+network I/O overlaps with CPU-bound encoding: a producer encodes record
+batches into fixed-size part buffers while uploader threads PUT the
+previous parts to S3.
+"""
+
+import io
+import queue
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+import pyarrow.parquet as pq
+
+from pipeline.exceptions import S3OperationError
+from pipeline.logging_config import create_logger
+
+logger = create_logger(__name__)
+
+# Rows fetched from DuckDB per Arrow record batch
+ROWS_PER_BATCH = 64 * 1024
+
+# Size of each multipart upload part (S3 minimum is 5 MiB except the last)
+PART_SIZE = 8 * 1024 * 1024
+
+# Maximum number of encoded parts waiting to be uploaded
+MAX_QUEUED_PARTS = 4
+
+# Number of threads uploading parts concurrently
+UPLOAD_WORKERS = 4
+
+
+def parse_s3_path(s3_path: str) -> Tuple[str, str]:
+    """Split an ``s3://bucket/key`` path into bucket and key.
+
+    Args:
+        s3_path: Full S3 path
+
+    Returns:
+        Tuple of (bucket, key)
+
+    Raises:
+        ValueError: If the path is not a valid S3 object path
+    """
+    if not s3_path.startswith("s3://"):
+        raise ValueError(f"Not an S3 path: {s3_path}")
+
+    bucket, _, key = s3_path[len("s3://") :].partition("/")
+    if not bucket or not key:
+        raise ValueError(f"S3 path must include a bucket and key: {s3_path}")
+
+    return bucket, key
+
+
+class _PartWriter(io.RawIOBase):
+    """Write-only file object that slices its output into upload parts.
+
+    Every time ``part_size`` bytes have been buffered, a numbered part is
+    pushed onto the queue. The bounded queue applies back-pressure to the
+    producer when the uploaders fall behind.
+    """
+
+    def __init__(self, parts: queue.Queue, part_size: int) -> None:
+        super().__init__()
+        self._parts = parts
+        self._part_size = part_size
+        self._buffer = bytearray()
+        self._position = 0
+        self._part_number = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._position
+
+    def write(self, data) -> int:
+        self._buffer += data
+        self._position += len(data)
+        while len(self._buffer) >= self._part_size:
+            self._emit(bytes(self._buffer[: self._part_size]))
+            del self._buffer[: self._part_size]
+        return len(data)
+
+    def close(self) -> None:
+        if not self.closed:
+            # The last part may be smaller than part_size, and an upload
+            # always needs at least one part
+            if self._buffer or self._part_number == 0:
+                self._emit(bytes(self._buffer))
+                self._buffer.clear()
+        super().close()
+
+    def _emit(self, body: bytes) -> None:
+        self._part_number += 1
+        self._parts.put((self._part_number, body))
+
+
+def stream_query_to_s3(
+    con: Any,
+    query: str,
+    s3_client: Any,
+    s3_path: str,
+    rows_per_batch: int = ROWS_PER_BATCH,
+    part_size: int = PART_SIZE,
+    max_queued_parts: int = MAX_QUEUED_PARTS,
+    upload_workers: int = UPLOAD_WORKERS,
+    metadata: Optional[Dict[str, str]] = None,
+    parameters: Optional[List[Any]] = None,
+) -> int:
+    """Stream the result of a DuckDB query to S3 as a single Parquet file.
+
+    The query result is read as Arrow record batches and encoded into
+    Parquet part buffers, which uploader threads send to S3 through one
+    multipart upload while the next parts are being encoded.
+
+    Args:
+        con: DuckDB connection
+        query: SQL query whose result is uploaded
+        s3_client: boto3 S3 client
+        s3_path: Destination path (``s3://bucket/key.parquet``)
+        rows_per_batch: Rows fetched from DuckDB per record batch
+        part_size: Size in bytes of each uploaded part
+        max_queued_parts: Maximum number of encoded parts awaiting upload
+        upload_workers: Number of concurrent part uploaders
+        metadata: User metadata stored on the uploaded object
+        parameters: Values bound to ``?`` placeholders in the query
+
+    Returns:
+        Number of rows written
+
+    Raises:
+        S3OperationError: If encoding or uploading fails
+    """
+    bucket, key = parse_s3_path(s3_path)
+    upload_id = s3_client.create_multipart_upload(
+        Bucket=bucket, Key=key, Metadata=metadata or {}
+    )["UploadId"]
+
+    parts: queue.Queue = queue.Queue(maxsize=max_queued_parts)
+    etags: Dict[int, str] = {}
+    errors: List[Exception] = []
+
+    def _upload_worker() -> None:
+        while True:
+            item = parts.get()
+            if item is None:
+                return
+            # Keep draining after a failure so the producer never blocks
+            if errors:
+                continue
+
+            part_number, body = item
+            try:
+                response = s3_client.upload_part(
+                    Bucket=bucket,
+                    Key=key,
+                    UploadId=upload_id,
+                    PartNumber=part_number,
+                    Body=body,
+                )
+                etags[part_number] = response["ETag"]
+            except Exception as e:
+                errors.append(e)
+
+    workers = [
+        threading.Thread(
+            target=_upload_worker, name=f"s3-part-upload-{i}", daemon=True
+        )
+        for i in range(upload_workers)
+    ]
+    for worker in workers:
+        worker.start()
+
+    row_count = 0
+    try:
+        try:
+            reader = con.execute(query, parameters).fetch_record_batch(
+                rows_per_batch
+            )
+            sink = _PartWriter(parts, part_size)
+            with pq.ParquetWriter(sink, reader.schema) as writer:
+                for batch in reader:
+                    # Stop reading and encoding once an upload has failed;
+                    # the multipart upload is aborted below
+                    if errors:
+                        raise errors[0]
+                    writer.write_batch(batch)
+                    row_count += batch.num_rows
+            sink.close()
+        finally:
+            for _ in workers:
+                parts.put(None)
+            for worker in workers:
+                worker.join()
+
+        if errors:
+            raise errors[0]
+
+        s3_client.complete_multipart_upload(
+            Bucket=bucket,
+            Key=key,
+            UploadId=upload_id,
+            MultipartUpload={
+                "Parts": [
+                    {"ETag": etags[number], "PartNumber": number}
+                    for number in sorted(etags)
+                ]
+            },
+        )
+    except Exception as e:
+        logger.error("Aborting multipart upload to %s: %s", s3_path, e)
+        s3_client.abort_multipart_upload(Bucket=bucket, Key=key, UploadId=upload_id)
+        raise S3OperationError(f"Streaming upload to {s3_path} failed: {e}") from e
+
+    logger.info("Streamed %s rows in %s parts to %s", row_count, len(etags), s3_path)
+    return row_count
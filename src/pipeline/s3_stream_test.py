@@ -0,0 +1,100 @@
+"""Test module for streaming DuckDB query results to S3.
+
+These tests stream queries into a moto-mocked bucket and check the
+uploaded Parquet files and that failed uploads are aborted.
+"""
+
+import io
+
+import boto3
+import duckdb
+import pyarrow.parquet as pq
+import pytest
+from moto import mock_aws
+
+from pipeline.exceptions import S3OperationError
+from pipeline.s3_stream import stream_query_to_s3
+
+BUCKET_NAME = "osaa-stream-test"
+S3_PATH = f"s3://{BUCKET_NAME}/dev/landing/edu/x.parquet"
+
+# Smallest part size S3 accepts for all but the last part
+PART_SIZE = 5 * 1024 * 1024
+
+
+@pytest.fixture
+def s3_client():
+    """Mocked S3 client with an empty bucket."""
+    with mock_aws():
+        client = boto3.client("s3", region_name="us-east-1")
+        client.create_bucket(Bucket=BUCKET_NAME)
+        yield client
+
+
+@pytest.fixture
+def con():
+    """In-memory DuckDB connection."""
+    connection = duckdb.connect()
+    yield connection
+    connection.close()
+
+
+def _read_table(s3_client):
+    body = s3_client.get_object(Bucket=BUCKET_NAME, Key="dev/landing/edu/x.parquet")
+    return pq.read_table(io.BytesIO(body["Body"].read()))
+
+
+def _assert_aborted(s3_client):
+    assert "Uploads" not in s3_client.list_multipart_uploads(Bucket=BUCKET_NAME)
+    assert "Contents" not in s3_client.list_objects_v2(Bucket=BUCKET_NAME)
+
+
+def test_multi_part_round_trip(s3_client, con):
+    """A result larger than one part is uploaded in parts and reads back."""
+    query = "SELECT i, md5(i::VARCHAR) AS digest FROM range(300000) t(i)"
+    row_count = stream_query_to_s3(
+        con, query, s3_client, S3_PATH, rows_per_batch=10000, part_size=PART_SIZE
+    )
+
+    head = s3_client.head_object(Bucket=BUCKET_NAME, Key="dev/landing/edu/x.parquet")
+    assert int(head["ETag"].strip('"').rpartition("-")[2]) >= 2
+    table = _read_table(s3_client)
+    assert row_count == table.num_rows == 300000
+    assert table.column_names == ["i", "digest"]
+
+
+def test_empty_result_uploads_single_part(s3_client, con):
+    """An empty result still produces a valid single-part Parquet file."""
+    row_count = stream_query_to_s3(
+        con, "SELECT 1 AS i WHERE false", s3_client, S3_PATH
+    )
+
+    head = s3_client.head_object(Bucket=BUCKET_NAME, Key="dev/landing/edu/x.parquet")
+    assert head["ETag"].endswith('-1"')
+    table = _read_table(s3_client)
+    assert row_count == table.num_rows == 0
+    assert table.column_names == ["i"]
+
+
+def test_query_error_aborts_upload(s3_client, con):
+    """A failing query aborts the multipart upload."""
+    with pytest.raises(S3OperationError):
+        stream_query_to_s3(con, "SELECT * FROM missing_table", s3_client, S3_PATH)
+
+    _assert_aborted(s3_client)
+
+
+def test_upload_part_error_aborts_upload(s3_client, con, monkeypatch):
+    """A failing part upload aborts the multipart upload."""
+
+    def upload_part(**kwargs):
+        raise RuntimeError("part upload failed")
+
+    monkeypatch.setattr(s3_client, "upload_part", upload_part)
+    query = "SELECT i, md5(i::VARCHAR) AS digest FROM range(300000) t(i)"
+    with pytest.raises(S3OperationError, match="part upload failed"):
+        stream_query_to_s3(
+            con, query, s3_client, S3_PATH, rows_per_batch=10000, part_size=PART_SIZE
+        )
+
+    _assert_aborted(s3_client)
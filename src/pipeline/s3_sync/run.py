@@ -4,21 +4,60 @@ This module provides functionality to sync SQLMesh database files with S3,
 including downloading existing DBs and uploading updated ones.
 """
 
+import functools
 import os
 import sys
-from pathlib import Path
-from typing import Optional
+from typing import Any, Optional
 
 import boto3
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config
 from botocore.exceptions import ClientError
 
 from pipeline.exceptions import S3OperationError
 from pipeline.logging_config import create_logger
 from pipeline.config import S3_BUCKET_NAME
+from pipeline.utils import S3_CLIENT_CONFIG
 
 logger = create_logger(__name__)
 
-def sync_db_with_s3(operation: str, db_path: str, bucket_name: str, s3_key: str) -> None:
+# Parallel ranged GETs / multipart PUTs for the (potentially large) DB file
+TRANSFER_CONFIG = TransferConfig(
+    max_concurrency=32,
+    multipart_threshold=16 * 1024 * 1024,
+    multipart_chunksize=8 * 1024 * 1024,
+    max_io_queue=1000,
+    use_threads=True,
+)
+
+# Opt-in S3 Transfer Acceleration (must also be enabled on the bucket)
+USE_ACCELERATE_ENDPOINT = (
+    os.getenv("S3_USE_ACCELERATE_ENDPOINT", "false").lower() == "true"
+)
+
+
+@functools.lru_cache(maxsize=1)
+def _default_s3_client() -> Any:
+    """
+    Return the default-credential-chain S3 client, built on first use.
+
+    Returns:
+        boto3 S3 client shared by all syncs in this process
+    """
+    config = S3_CLIENT_CONFIG
+    if USE_ACCELERATE_ENDPOINT:
+        config = config.merge(Config(s3={'use_accelerate_endpoint': True}))
+    return boto3.client('s3', config=config)
+
+
+def sync_db_with_s3(
+    operation: str,
+    db_path: str,
+    bucket_name: str,
+    s3_key: str,
+    s3_client: Optional[Any] = None,
+    target: Optional[str] = None,
+) -> None:
     """
     Sync SQLMesh database with S3.
 
@@ -27,12 +66,29 @@ def sync_db_with_s3(operation: str, db_path: str, bucket_name: str, s3_key: str)
         db_path: Local path to the SQLMesh database file
         bucket_name: S3 bucket name
         s3_key: Key (path) in S3 bucket
+        s3_client: Already-initialized S3 client (default: shared default-chain client)
+        target: Target environment gating uploads (default: TARGET env variable)
 
     Raises:
         S3OperationError: If S3 operations fail
     """
     try:
-        s3_client = boto3.client('s3')
+        # Only allow uploads of an existing DB in prod/qa environments;
+        # checked before any client is built so a skipped upload costs nothing
+        if operation == "upload":
+            if target is None:
+                target = os.getenv('TARGET', '')
+            if target.lower() not in ['prod', 'qa']:
+                logger.warning("Upload operation restricted to prod/qa targets only")
+                return
+            if not os.path.isfile(db_path):
+                logger.warning(f"Local DB file not found at {db_path}, skipping upload")
+                return
+
+        # Building a client loads service models and a fresh connection pool,
+        # so reuse the caller's client or the shared default one
+        if s3_client is None:
+            s3_client = _default_s3_client()
         
         if operation == "download":
             logger.info("Attempting to download DB from S3...")
@@ -40,7 +96,9 @@ def sync_db_with_s3(operation: str, db_path: str, bucket_name: str, s3_key: str)
                 s3_client.head_object(Bucket=bucket_name, Key=s3_key)
                 # File exists, download it
                 os.makedirs(os.path.dirname(db_path), exist_ok=True)
-                s3_client.download_file(bucket_name, s3_key, db_path)
+                s3_client.download_file(
+                    bucket_name, s3_key, db_path, Config=TRANSFER_CONFIG
+                )
                 logger.info("Successfully downloaded existing DB from S3")
             except ClientError as e:
                 if e.response['Error']['Code'] == '404':
@@ -49,17 +107,11 @@ def sync_db_with_s3(operation: str, db_path: str, bucket_name: str, s3_key: str)
                     raise S3OperationError(f"Error checking S3 object: {str(e)}")
                     
         elif operation == "upload":
-            # Only allow uploads in prod/qa environments
-            if os.getenv('TARGET', '').lower() not in ['prod', 'qa']:
-                logger.warning("Upload operation restricted to prod/qa targets only")
-                return
-                
             logger.info("Uploading DB to S3...")
-            if os.path.exists(db_path):
-                s3_client.upload_file(db_path, bucket_name, s3_key)
-                logger.info("Successfully uploaded DB to S3")
-            else:
-                logger.warning(f"Local DB file not found at {db_path}, skipping upload")
+            s3_client.upload_file(
+                db_path, bucket_name, s3_key, Config=TRANSFER_CONFIG
+            )
+            logger.info("Successfully uploaded DB to S3")
                 
     except Exception as e:
         error_msg = f"S3 {operation} operation failed: {str(e)}"
@@ -1,13 +1,73 @@
+import asyncio
 import functools
+import hashlib
 import os
+import random
 import re
+import string
+import threading
 import time
-from typing import Any, Callable, Dict, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, FrozenSet, Iterator, List, Optional, Tuple
 
 import boto3
+import botocore.session
+from botocore.config import Config
+from botocore.credentials import DeferredRefreshableCredentials
 from botocore.exceptions import ClientError
 
-from pipeline.logging_config import create_logger, log_exception
+from pipeline.logging_config import create_logger
+
+logger = create_logger(__name__)
+
+
+# AWS error codes that indicate a transient failure worth retrying
+RETRYABLE_ERROR_CODES = frozenset(
+    {
+        "SlowDown",
+        "Throttling",
+        "ThrottlingException",
+        "RequestLimitExceeded",
+        "TooManyRequestsException",
+        "RequestThrottled",
+        "ServiceUnavailable",
+        "RequestTimeout",
+        "InternalError",
+        "500",
+        "503",
+    }
+)
+
+
+def is_retryable_error(error: Exception) -> bool:
+    """
+    Check whether an error is transient and should be retried.
+
+    AWS ClientErrors are only retried for throttling and server-side codes;
+    permanent failures such as AccessDenied or NoSuchKey fail fast.
+
+    :param error: The exception raised by the wrapped call
+    :return: True if the call should be retried
+    """
+    if isinstance(error, ClientError):
+        return error.response.get("Error", {}).get("Code") in RETRYABLE_ERROR_CODES
+    return True
+
+
+def retry_after_seconds(error: Exception) -> float:
+    """
+    Read the server-requested wait from a throttled AWS response.
+
+    :param error: The exception raised by the wrapped call
+    :return: Seconds from the Retry-After header, or 0 if absent or not numeric
+    """
+    if not isinstance(error, ClientError):
+        return 0.0
+    headers = error.response.get("ResponseMetadata", {}).get("HTTPHeaders", {})
+    try:
+        return max(0.0, float(headers.get("retry-after", 0)))
+    except (TypeError, ValueError):
+        return 0.0
 
 
 def retry(
@@ -15,34 +75,63 @@ def retry(
     delay: float = 1.0,
     backoff: float = 2.0,
     exceptions: Tuple[type, ...] = (Exception,),
+    max_delay: float = 30.0,
 ) -> Callable:
     """
-    Retry decorator with exponential backoff.
+    Retry decorator with truncated, full-jitter exponential backoff.
+
+    Each sleep is drawn uniformly from ``[0, delay * backoff ** (attempt - 1)]``
+    and capped at ``max_delay``, so concurrent workers do not retry in lockstep.
+    A ``Retry-After`` header on a throttled AWS response raises the sleep to
+    at least the requested wait (still capped at ``max_delay``).
+    Coroutine functions are supported and back off with ``asyncio.sleep``.
 
     :param max_attempts: Maximum number of retry attempts
     :param delay: Initial delay between retries
     :param backoff: Multiplier for delay between retries
     :param exceptions: Tuple of exceptions to catch and retry
+    :param max_delay: Upper bound for a single sleep
     :return: Decorated function
     """
 
     def decorator(func: Callable) -> Callable:
+        logger = create_logger(func.__module__)
+
+        def next_delay(attempt: int, error: Exception) -> float:
+            """Log a failed attempt and return the sleep before the next one."""
+            logger.warning("Attempt %s failed: %s", attempt, error)
+
+            if not is_retryable_error(error):
+                logger.error("Error is not retryable, giving up")
+                raise error
+
+            if attempt == max_attempts:
+                logger.error("All %s attempts failed", max_attempts)
+                raise error
+
+            jittered = random.uniform(0, delay * backoff ** (attempt - 1))
+            return min(max_delay, max(jittered, retry_after_seconds(error)))
+
+        # Coroutines must not block the event loop while backing off
+        if asyncio.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                for attempt in range(1, max_attempts + 1):
+                    try:
+                        return await func(*args, **kwargs)
+                    except exceptions as e:
+                        await asyncio.sleep(next_delay(attempt, e))
+
+            return async_wrapper
+
         @functools.wraps(func)
         def wrapper(*args, **kwargs):
-            logger = create_logger(func.__module__)
-            current_delay = delay
             for attempt in range(1, max_attempts + 1):
                 try:
                     return func(*args, **kwargs)
                 except exceptions as e:
-                    logger.warning(f"Attempt {attempt} failed: {e}")
-
-                    if attempt == max_attempts:
-                        logger.error(f"All {max_attempts} attempts failed")
-                        raise
-
-                    time.sleep(current_delay)
-                    current_delay *= backoff
+                    time.sleep(next_delay(attempt, e))
 
         return wrapper
 
@@ -55,8 +144,6 @@ def log_aws_initialization_error(error):
 
     :param error: The exception raised during AWS S3 initialization
     """
-    logger = create_logger(__name__)
-
     # Comprehensive error logging
     logger.critical(f"AWS S3 Initialization Failed: {error}")
     logger.critical("Troubleshooting:")
@@ -65,16 +152,58 @@ def log_aws_initialization_error(error):
     logger.critical("3. Ensure AWS IAM user has S3 access")
 
 
+# Shared S3 client settings: a connection pool large enough for threaded
+# callers (tunable via BOTO_MAX_POOL_CONNECTIONS), keep-alive sockets and
+# botocore's adaptive retry mode, which also rate-limits under throttling
+S3_CLIENT_CONFIG = Config(
+    max_pool_connections=int(os.getenv("BOTO_MAX_POOL_CONNECTIONS", "50")),
+    retries={"mode": "adaptive", "max_attempts": 5},
+    tcp_keepalive=True,
+)
+
+# Cached (s3_client, session) shared by all s3_init callers
+_cached_session: Optional[Tuple[Any, Any]] = None
+_session_lock = threading.Lock()
+
+
 def s3_init(return_session: bool = False) -> Tuple[Any, Optional[Any]]:
     """
     Initialize S3 client using STS to assume a role.
 
+    The client and session are created once and shared by all callers. The
+    session's credentials re-assume the role on their own shortly before
+    they expire, so the cached client never goes stale and the AssumeRole
+    round-trip happens once per credential lifetime instead of once per call.
+
     :param return_session: If True, returns both client and session
     :return: S3 client, and optionally the session
     :raises ClientError: If S3 initialization fails
     """
-    logger = create_logger(__name__)
+    global _cached_session
 
+    with _session_lock:
+        if _cached_session is None:
+            _cached_session = _assume_role_session()
+        s3_client, session = _cached_session
+
+    return (s3_client, session) if return_session else s3_client
+
+
+def clear_s3_cache() -> None:
+    """Drop the cached S3 client so the next s3_init re-assumes the role."""
+    global _cached_session
+
+    with _session_lock:
+        _cached_session = None
+
+
+def _assume_role_session() -> Tuple[Any, Any]:
+    """
+    Build an S3 client whose credentials come from assuming the pipeline role.
+
+    :return: S3 client and session
+    :raises ClientError: If S3 initialization fails
+    """
     try:
         # Get role ARN from environment
         role_arn = os.environ.get("AWS_ROLE_ARN")
@@ -86,28 +215,32 @@ def s3_init(return_session: bool = False) -> Tuple[Any, Optional[Any]]:
         # Create STS client
         sts_client = boto3.client("sts")
 
-        # Assume role
-        assumed_role_object = sts_client.assume_role(
-            RoleArn=role_arn, RoleSessionName="OsaaMvpSession"
-        )
-
-        # Get temporary credentials
-        credentials = assumed_role_object["Credentials"]
-
-        # Create session with temporary credentials
-        session = boto3.Session(
-            aws_access_key_id=credentials["AccessKeyId"],
-            aws_secret_access_key=credentials["SecretAccessKey"],
-            aws_session_token=credentials["SessionToken"],
-            region_name=region,
+        def refresh_credentials() -> Dict[str, str]:
+            """Assume the role and return credentials in botocore's format."""
+            credentials = sts_client.assume_role(
+                RoleArn=role_arn, RoleSessionName="OsaaMvpSession"
+            )["Credentials"]
+            return {
+                "access_key": credentials["AccessKeyId"],
+                "secret_key": credentials["SecretAccessKey"],
+                "token": credentials["SessionToken"],
+                "expiry_time": credentials["Expiration"].isoformat(),
+            }
+
+        # Create session whose credentials refresh themselves before expiry
+        botocore_session = botocore.session.get_session()
+        botocore_session._credentials = DeferredRefreshableCredentials(
+            refresh_using=refresh_credentials, method="sts-assume-role"
         )
+        session = boto3.Session(botocore_session=botocore_session, region_name=region)
 
         # Create S3 client
-        s3_client = session.client("s3")
+        s3_client = session.client("s3", config=S3_CLIENT_CONFIG)
 
-        # Verify S3 access
+        # Assume the role and verify the credentials with a small signed STS
+        # request rather than pulling the full ListBuckets payload
         try:
-            s3_client.list_buckets()
+            session.client("sts").get_caller_identity()
             logger.info("S3 client initialized successfully with assumed role.")
         except ClientError as access_error:
             error_code = access_error.response["Error"]["Code"]
@@ -116,7 +249,7 @@ def s3_init(return_session: bool = False) -> Tuple[Any, Optional[Any]]:
             logger.error(f"Detailed Error Message: {error_message}")
             raise
 
-        return (s3_client, session) if return_session else s3_client
+        return s3_client, session
 
     except Exception as e:
         logger.critical(f"Failed to initialize S3 client: {e}")
@@ -125,6 +258,24 @@ def s3_init(return_session: bool = False) -> Tuple[Any, Optional[Any]]:
 
 
 # File path and naming utilities
+
+# Characters kept as-is by standardize_filename; other ASCII maps to "_"
+_FILENAME_ALLOWED = set(string.ascii_letters + string.digits + "_")
+_FILENAME_TABLE = str.maketrans(
+    {c: "_" for c in map(chr, range(128)) if c not in _FILENAME_ALLOWED}
+)
+# Fallback for non-ASCII characters, which the table does not cover
+_FILENAME_PATTERN = re.compile(r"[^a-zA-Z0-9_]")
+
+# S3 object metadata key recording the checksum of an object's source file
+SOURCE_CHECKSUM_KEY = "source-sha256"
+
+# Directories that never contain pipeline data files
+DEFAULT_SKIP_DIRS = frozenset(
+    {".git", "__pycache__", ".venv", "node_modules", ".ipynb_checkpoints"}
+)
+
+
 def get_filename_from_path(file_path: str) -> str:
     """Extract filename from a given file path.
 
@@ -146,25 +297,174 @@ def standardize_filename(filename: str) -> str:
     Returns:
         Standardized filename with only alphanumeric characters and underscores
     """
-    return re.sub(r"[^a-zA-Z0-9_]", "_", filename).lower()
+    standardized = filename.translate(_FILENAME_TABLE)
+    if not standardized.isascii():
+        standardized = _FILENAME_PATTERN.sub("_", standardized)
+    return standardized.lower()
+
 
+def file_checksum(file_path: str, chunk_size: int = 1024 * 1024) -> str:
+    """Compute the SHA-256 checksum of a file.
+
+    Args:
+        file_path: Path to the file
+        chunk_size: Number of bytes read per iteration
 
-def collect_file_paths(directory: str, file_extension: str) -> Dict[str, str]:
+    Returns:
+        Hex digest of the file contents
+    """
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _scan_directory(
+    directory: str,
+    file_extension: str,
+    skip_dirs: FrozenSet[str] = DEFAULT_SKIP_DIRS,
+    skip_hidden: bool = True,
+) -> Tuple[List[os.DirEntry], List[str]]:
+    """Scan a single directory level.
+
+    Args:
+        directory: Directory to scan
+        file_extension: File extension to filter (e.g., '.csv')
+        skip_dirs: Subdirectory names that are not descended into
+        skip_hidden: If True, subdirectories starting with '.' are skipped
+
+    Returns:
+        Tuple of (matching file entries, subdirectory paths); both empty if
+        the directory cannot be read
+    """
+    files: List[os.DirEntry] = []
+    subdirs: List[str] = []
+    try:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    name = entry.name
+                    if name in skip_dirs or (skip_hidden and name.startswith(".")):
+                        continue
+                    subdirs.append(entry.path)
+                elif entry.name.endswith(file_extension) and entry.is_file():
+                    files.append(entry)
+    except OSError as e:
+        # Missing or unreadable directories are skipped, as os.walk does
+        logger.warning("Skipping directory %s: %s", directory, e)
+        return [], []
+    return files, subdirs
+
+
+def _scan_files(
+    directory: str,
+    file_extension: str,
+    skip_dirs: FrozenSet[str] = DEFAULT_SKIP_DIRS,
+    skip_hidden: bool = True,
+    max_workers: Optional[int] = None,
+) -> Iterator[os.DirEntry]:
+    """Recursively yield file entries matching an extension.
+
+    The tree is walked breadth-first and the directories of each level are
+    scanned concurrently, so per-directory syscall latency overlaps. Uses
+    os.scandir so the file/directory checks reuse the cached DirEntry type
+    information instead of issuing a stat per entry.
+
+    Args:
+        directory: Directory to search for files
+        file_extension: File extension to filter (e.g., '.csv')
+        skip_dirs: Subdirectory names that are not descended into
+        skip_hidden: If True, subdirectories starting with '.' are skipped
+        max_workers: Number of scanning threads (default: min(8, CPU count))
+
+    Yields:
+        DirEntry for every matching file
+    """
+    max_workers = max_workers or min(8, os.cpu_count() or 1)
+    pending = [directory]
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        while pending:
+            next_level: List[str] = []
+            for files, subdirs in executor.map(
+                lambda d: _scan_directory(d, file_extension, skip_dirs, skip_hidden),
+                pending,
+            ):
+                yield from files
+                next_level.extend(subdirs)
+            pending = next_level
+
+
+def iter_file_paths(
+    directory: str,
+    file_extension: str,
+    *,
+    skip_dirs: FrozenSet[str] = DEFAULT_SKIP_DIRS,
+    skip_hidden: bool = True,
+) -> Iterator[Tuple[str, str]]:
+    """Lazily yield file paths for a specific file extension in a directory.
+
+    Args:
+        directory: Directory to search for files
+        file_extension: File extension to filter (e.g., '.csv')
+        skip_dirs: Subdirectory names that are not descended into
+        skip_hidden: If True, subdirectories starting with '.' are skipped
+
+    Yields:
+        Tuples of (standardized filename, full file path)
+    """
+    for entry in _scan_files(directory, file_extension, skip_dirs, skip_hidden):
+        # entry.name is already a basename and entry.path already joined, so
+        # only the extension needs stripping
+        name = entry.name
+        filename = name.rpartition(".")[0] or name
+        yield standardize_filename(filename), entry.path
+
+
+def iter_relative_file_paths(
+    directory: str,
+    file_extension: str,
+    *,
+    skip_dirs: FrozenSet[str] = DEFAULT_SKIP_DIRS,
+    skip_hidden: bool = True,
+) -> Iterator[Tuple[str, str]]:
+    """Lazily yield files for a specific extension relative to a directory.
+
+    Args:
+        directory: Directory to search for files
+        file_extension: File extension to filter (e.g., '.csv')
+        skip_dirs: Subdirectory names that are not descended into
+        skip_hidden: If True, subdirectories starting with '.' are skipped
+
+    Yields:
+        Tuples of (subdirectory relative to directory, file name); the
+        subdirectory is "" for files directly inside directory
+    """
+    for entry in _scan_files(directory, file_extension, skip_dirs, skip_hidden):
+        subdir = os.path.relpath(os.path.dirname(entry.path), directory)
+        yield ("" if subdir == os.curdir else subdir), entry.name
+
+
+def collect_file_paths(
+    directory: str,
+    file_extension: str,
+    *,
+    skip_dirs: FrozenSet[str] = DEFAULT_SKIP_DIRS,
+    skip_hidden: bool = True,
+) -> Dict[str, str]:
     """Collect file paths for a specific file extension in a directory.
 
     Args:
         directory: Directory to search for files
         file_extension: File extension to filter (e.g., '.csv')
+        skip_dirs: Subdirectory names that are not descended into
+        skip_hidden: If True, subdirectories starting with '.' are skipped
 
     Returns:
         Dictionary mapping standardized filenames to full file paths
     """
-    file_paths: Dict[str, str] = {}
-    for root, _, files in os.walk(directory):
-        for file in files:
-            if file.endswith(file_extension):
-                full_path = os.path.join(root, file)
-                filename = get_filename_from_path(file)
-                std_filename = standardize_filename(filename)
-                file_paths[std_filename] = full_path
-    return file_paths
+    return dict(
+        iter_file_paths(
+            directory, file_extension, skip_dirs=skip_dirs, skip_hidden=skip_hidden
+        )
+    )